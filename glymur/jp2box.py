@@ -1197,21 +1197,17 @@ class DataReferenceBox(Jp2kBox):
         """Write a Data Reference box to file."""
         self._write_validate()
 
-        # Very similar to the way a superbox is written.
-        orig_pos = fptr.tell()
-        fptr.write(struct.pack(">I4s", 0, b"dtbl"))
-
-        # Write the number of data entry url boxes.
-        write_buffer = struct.pack(">H", len(self.DR))
-        fptr.write(write_buffer)
-
+        # Serialize the data entry url boxes first so that the length is known
+        # up front and the entire box can be written at once.
+        b = io.BytesIO()
         for box in self.DR:
-            box.write(fptr)
+            box.write(b)
+        child_buffer = b.getvalue()
 
-        end_pos = fptr.tell()
-        fptr.seek(orig_pos)
-        fptr.write(struct.pack(">I", end_pos - orig_pos))
-        fptr.seek(end_pos)
+        # The header includes the number of data entry url boxes.
+        length = 8 + 2 + len(child_buffer)
+        write_buffer = struct.pack(">I4sH", length, b"dtbl", len(self.DR))
+        fptr.write(write_buffer + child_buffer)
 
     def __str__(self):
         title = Jp2kBox.__str__(self)
@@ -1523,16 +1519,17 @@ class FragmentListBox(Jp2kBox):
         self._validate(writing=True)
         num_items = len(self.fragment_offset)
         length = 8 + 2 + num_items * 14
-        fptr.write(struct.pack(">I4s", length, b"flst"))
-        fptr.write(struct.pack(">H", num_items))
-        for j in range(num_items):
-            write_buffer = struct.pack(
-                ">QIH",
-                self.fragment_offset[j],
-                self.fragment_length[j],
-                self.data_reference[j],
-            )
-            fptr.write(write_buffer)
+
+        # Interleave the offsets, lengths, and references so that the entire
+        # box can be packed and written in one go.
+        items = zip(
+            self.fragment_offset, self.fragment_length, self.data_reference
+        )
+        data = [x for item in items for x in item]
+
+        fmt = ">I4sH" + "QIH" * num_items
+        write_buffer = struct.pack(fmt, length, b"flst", num_items, *data)
+        fptr.write(write_buffer)
 
     @classmethod
     def parse(cls, fptr, offset, length):
@@ -3442,8 +3439,7 @@ class DataEntryURLBox(Jp2kBox):
             self.flag[1],
             self.flag[2],
         )
-        fptr.write(write_buffer)
-        fptr.write(url)
+        fptr.write(write_buffer + url)
 
     def __repr__(self):
         msg = "glymur.jp2box.DataEntryURLBox({version}, {flag}, '{url}')"
@@ -1366,8 +1366,10 @@ def write_tile(codec, tile_index, data, *pargs):
         The jpeg2000 codec
     tile_index : int
         The index of the tile to write, zero-indexing assumed
-    data : array
-        Image data.  The memory layout is planar, not the usual C-order.
+    data : array or ctypes.POINTER(ctypes.c_uint8)
+        Image data.  The memory layout is planar, not the usual C-order.  A
+        pointer to data that has already been staged may be passed instead,
+        in which case data_size must also be provided.
     data_size : int, optional
         Size of a tile in bytes.  If not provided, it will be inferred.
     stream : STREAM_TYPE_P
@@ -1377,14 +1379,22 @@ def write_tile(codec, tile_index, data, *pargs):
     ------
     RuntimeError
         If the OpenJPEG library routine opj_write_tile fails.
+    TypeError
+        If data is not an array and data_size is not provided.
     """
     if len(pargs) == 2:
         # old signature
         data_size, stream = pargs
-    else:
+    elif isinstance(data, np.ndarray):
         # new signature
         data_size = data.nbytes
         stream = pargs[0]
+    else:
+        msg = (
+            "The size of the tile in bytes must be provided when the tile "
+            "data is not a numpy array."
+        )
+        raise TypeError(msg)
 
     OPENJP2.opj_write_tile.argtypes = [
         CODEC_TYPE,
@@ -1395,7 +1405,11 @@ def write_tile(codec, tile_index, data, *pargs):
     ]
     OPENJP2.opj_write_tile.restype = check_error
 
-    datap = data.ctypes.data_as(ctypes.POINTER(ctypes.c_uint8))
+    if isinstance(data, np.ndarray):
+        datap = data.ctypes.data_as(ctypes.POINTER(ctypes.c_uint8))
+    else:
+        datap = data
+
     OPENJP2.opj_write_tile(
         codec,
         ctypes.c_uint32(int(tile_index)),
@@ -11,7 +11,6 @@ License:  MIT
 import sys
 
 # Third party library imports ...
-from packaging.version import parse
 import numpy as np
 
 # Local imports ...
@@ -22,10 +21,16 @@ from .lib import tiff
 # setup.py
 version = "0.14.1"
 
-version_tuple = parse(version).release
+
+def _release_tuple(s):
+    """Convert a plain dotted version string like "2.5.0" to (2, 5, 0)."""
+    return tuple(int(x) for x in s.split("."))
+
+
+version_tuple = _release_tuple(version)
 
 openjpeg_version = opj2.version()
-openjpeg_version_tuple = parse(openjpeg_version).release
+openjpeg_version_tuple = _release_tuple(openjpeg_version)
 
 tiff_version = tiff.getVersion()
 
@@ -3,7 +3,11 @@ Test fixtures common to more than one test point.
 """
 
 # Standard library imports
+import functools
 import importlib.metadata as im
+import importlib.resources as ir
+import importlib.util
+import operator
 import pathlib
 import platform
 import shutil
@@ -11,10 +15,8 @@ import sys
 import tempfile
 import unittest
 
-# are we anaconda?
-try:
-    import conda  # noqa : F401
-except ImportError:
+# are we anaconda?  No need to actually import conda to find out.
+if importlib.util.find_spec('conda') is None:
     ANACONDA = False
 else:
     ANACONDA = True
@@ -75,17 +77,44 @@ else:
     TIFF_NOT_AVAILABLE_MSG = None
 
 
+@functools.lru_cache(maxsize=None)
+def load_test_data(package, name):
+    """
+    Read one of the text files shipped with the test data.  Many of these
+    files are consulted by more than one test, so only read each one once.
+
+    Parameters
+    ----------
+    package : str
+        Test data package, e.g. 'tests.data.misc'.
+    name : str
+        Name of the file within the package.
+    """
+    return ir.files(package).joinpath(name).read_text(encoding='utf-8')
+
+
+# Extract the SIZ segment fields that are compared between codestreams.
+get_siz_fields = operator.attrgetter(
+    'rsiz', 'xsiz', 'ysiz', 'xosiz', 'yosiz', 'xtsiz', 'ytsiz',
+    'xtosiz', 'ytosiz', 'bitdepth', 'xrsiz', 'yrsiz'
+)
+
+# Extract the file type box fields that must match exactly.
+get_ftyp_fields = operator.attrgetter('brand', 'minor_version')
+
+
 class TestCommon(unittest.TestCase):
     """
     Common setup for many if not all tests.
     """
 
-    def setUp(self):
-        # Supply paths to these three shipping example files.
-        self.jp2file = glymur.data.nemo()
-        self.j2kfile = glymur.data.goodstuff()
-        self.jpxfile = glymur.data.jpxfile()
+    # Supply paths to these three shipping example files.  They never change,
+    # so resolve them just once rather than for each test.
+    jp2file = glymur.data.nemo()
+    j2kfile = glymur.data.goodstuff()
+    jpxfile = glymur.data.jpxfile()
 
+    def setUp(self):
         # Create a temporary directory to be cleaned up following each test, as
         # well as names for a JP2 and a J2K file.
         self.test_dir = tempfile.mkdtemp()
@@ -123,9 +152,3 @@ class TestJPEGCommon(TestCommon):
             None
         )
         cls.rocket = jpeg.locate()
-
-    def setUp(self):
-        super().setUp()
-
-    def tearDown(self):
-        super().tearDown()
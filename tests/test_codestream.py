@@ -274,12 +274,6 @@ class TestSuite(fixtures.TestCommon):
 
 class TestCodestreamRepr(unittest.TestCase):
 
-    def setUp(self):
-        self.jp2file = glymur.data.nemo()
-
-    def tearDown(self):
-        pass
-
     def test_soc(self):
         """Test SOC segment repr"""
         segment = glymur.codestream.SOCsegment()
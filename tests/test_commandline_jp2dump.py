@@ -47,11 +47,9 @@ class TestSuite(fixtures.TestCommon):
 
         # shave off the  non-main-header segments
         expected = (
-            ir.files('tests.data.misc')
-              .joinpath('nemo.txt')
-              .read_text()
-              .rstrip()
-              .split('\n')[:52]
+            fixtures.load_test_data('tests.data.misc', 'nemo.txt')
+            .rstrip()
+            .split('\n')[:52]
         )
         expected = '\n'.join(expected)
         self.assertEqual(actual, expected)
@@ -62,11 +60,9 @@ class TestSuite(fixtures.TestCommon):
 
         # shave off the codestream details
         expected = (
-            ir.files('tests.data.misc')
-              .joinpath('nemo.txt')
-              .read_text()
-              .rstrip()
-              .split('\n')[:17]
+            fixtures.load_test_data('tests.data.misc', 'nemo.txt')
+            .rstrip()
+            .split('\n')[:17]
         )
         expected = '\n'.join(expected)
         self.assertEqual(actual, expected)
@@ -77,11 +73,9 @@ class TestSuite(fixtures.TestCommon):
 
         # shave off the  non-main-header segments
         expected = (
-            ir.files('tests.data.misc')
-              .joinpath('nemo.txt')
-              .read_text()
-              .rstrip()
-              .split('\n')[:52]
+            fixtures.load_test_data('tests.data.misc', 'nemo.txt')
+            .rstrip()
+            .split('\n')[:52]
         )
         expected = '\n'.join(expected)
         self.assertEqual(actual, expected)
@@ -90,10 +84,8 @@ class TestSuite(fixtures.TestCommon):
         """Verify dumping with -c 2, print entire jp2 jacket, codestream."""
         actual = self.run_jp2dump(['', '-c', '2', self.jp2file])
         expected = (
-            ir.files('tests.data.misc')
-              .joinpath('nemo.txt')
-              .read_text()
-              .rstrip()
+            fixtures.load_test_data('tests.data.misc', 'nemo.txt')
+            .rstrip()
         )
         self.maxDiff = None
         self.assertEqual(actual, expected)
@@ -118,10 +110,10 @@ class TestSuite(fixtures.TestCommon):
             actual = stdout.getvalue().strip()
 
         expected = (
-            ir.files('tests.data.misc')
-              .joinpath('goodstuff_codestream_header.txt')
-              .read_text()
-              .rstrip()
+            fixtures.load_test_data(
+                'tests.data.misc', 'goodstuff_codestream_header.txt'
+            )
+            .rstrip()
         )
         self.assertEqual(expected, actual)
 
@@ -133,10 +125,10 @@ class TestSuite(fixtures.TestCommon):
             actual = fake_out.getvalue().strip()
 
         expected = (
-            ir.files('tests.data.misc')
-              .joinpath('goodstuff_with_full_header.txt')
-              .read_text()
-              .rstrip()
+            fixtures.load_test_data(
+                'tests.data.misc', 'goodstuff_with_full_header.txt'
+            )
+            .rstrip()
         )
         self.assertIn(expected, actual)
 
@@ -151,19 +143,15 @@ class TestSuite(fixtures.TestCommon):
         actual = self.run_jp2dump(['', '-s', self.jp2file])
 
         expected = (
-            ir.files('tests.data.misc')
-              .joinpath('nemo_dump_short.txt')
-              .read_text()
-              .rstrip()
+            fixtures.load_test_data('tests.data.misc', 'nemo_dump_short.txt')
+            .rstrip()
         )
         self.assertEqual(actual, expected)
 
     def test_suppress_xml(self):
         """Verify dumping with -x, suppress XML."""
 
-        s = ir.files('tests.data.conformance') \
-              .joinpath('file1_xml.txt') \
-              .read_text()
+        s = fixtures.load_test_data('tests.data.conformance', 'file1_xml.txt')
         elt = ET.fromstring(s)
         xml = ET.ElementTree(elt)
         box = jp2box.XMLBox(xml=xml, length=439, offset=36)
@@ -176,10 +164,8 @@ class TestSuite(fixtures.TestCommon):
 
         # shave off the XML and non-main-header segments
         expected = (
-            ir.files('tests.data.misc')
-              .joinpath('appended_xml_box.txt')
-              .read_text()
-              .rstrip()
+            fixtures.load_test_data('tests.data.misc', 'appended_xml_box.txt')
+            .rstrip()
         )
 
         self.assertEqual(actual, expected)
@@ -48,9 +48,6 @@ class TestSuitePathToLibrary(TestCommon):
     problem in CI environments, just development environments.
     """
 
-    def setUp(self):
-        super().setUp()
-
     def tearDown(self):
         """
         Do the normal tear-down, but then make sure that we reload the openjp2
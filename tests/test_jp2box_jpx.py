@@ -3,12 +3,12 @@
 Test suite specifically targeting JPX box layout.
 """
 # Standard library imports ...
+import copy
 import ctypes
 import importlib.resources as ir
 from io import BytesIO
 import shutil
 import struct
-import tempfile
 import warnings
 
 # Third party library imports ...
@@ -29,27 +29,31 @@ from glymur.jp2box import (
 )
 from . import fixtures
 
+# Box header, a free box with 4 bytes of content, and a fragment list box
+# body with a single fragment.
+_BOX_HDR = struct.Struct(">I4s")
+_FREE = struct.Struct(">I4sI")
+_FLST_ENTRY = struct.Struct(">HQIH")
+
+# A data entry URL padded with trailing nulls, and how it should read back.
+_URL2 = "http://glymur.readthedocs.org" + "\0" * 3
+_URL2_STRIPPED = _URL2.rstrip("\0")
+
 
 class TestJPXWrap(fixtures.TestCommon):
     """Test suite for wrapping JPX files."""
 
-    def setUp(self):
-        super().setUp()
-
-        raw_xml = b"""<?xml version="1.0"?>
-        <data>
-            <country name="Liechtenstein">
-                <rank>1</rank>
-                <year>2008</year>
-                <gdppc>141100</gdppc>
-                <neighbor name="Austria" direction="E"/>
-                <neighbor name="Switzerland" direction="W"/>
-            </country>
-        </data>"""
-        self.xmlfile = self.test_dir_path / "liechtenstein.xml"
-        with self.xmlfile.open(mode="wb") as tfile:
-            tfile.write(raw_xml)
-            tfile.flush()
+    @classmethod
+    def setUpClass(cls):
+        """
+        Parse the JP2 file to be rewrapped just once.  Each test must work on
+        its own copy of the boxes, as the tests modify them before wrapping.
+        The sample XML document is never modified, so it can be shared as is.
+        """
+        cls.jp2 = Jp2k(cls.jp2file)
+
+        b = BytesIO(b'<?xml version="1.0"?><data>0</data>')
+        cls.xml = ET.parse(b)
 
     def test_jpx_ftbl_no_codestream(self):
         """
@@ -121,8 +125,8 @@ class TestJPXWrap(fixtures.TestCommon):
 
     def test_jp2_with_jpx_box(self):
         """If the brand is jp2, then no jpx boxes are allowed."""
-        jp2 = Jp2k(self.jp2file)
-        boxes = jp2.box
+        jp2 = self.jp2
+        boxes = copy.deepcopy(jp2.box)
 
         boxes.append(glymur.jp2box.AssociationBox())
 
@@ -132,8 +136,8 @@ class TestJPXWrap(fixtures.TestCommon):
 
     def test_jpch_jplh(self):
         """Write a codestream header, compositing layer header box."""
-        jp2 = Jp2k(self.jp2file)
-        boxes = jp2.box
+        jp2 = self.jp2
+        boxes = copy.deepcopy(jp2.box)
 
         # The ftyp box must be modified to jpx.
         boxes[1].brand = "jpx "
@@ -152,8 +156,8 @@ class TestJPXWrap(fixtures.TestCommon):
 
     def test_cgrp(self):
         """Write a color group box."""
-        jp2 = Jp2k(self.jp2file)
-        boxes = jp2.box
+        jp2 = self.jp2
+        boxes = copy.deepcopy(jp2.box)
 
         # The ftyp box must be modified to jpx.
         boxes[1].brand = "jpx "
@@ -169,14 +173,15 @@ class TestJPXWrap(fixtures.TestCommon):
         with open(self.temp_jpx_filename, mode="wb") as tfile:
             jpx = jp2.wrap(tfile.name, boxes=boxes)
 
-            self.assertEqual(jpx.box[-1].box_id, "cgrp")
-            self.assertEqual(jpx.box[-1].box[0].box_id, "colr")
-            self.assertEqual(jpx.box[-1].box[1].box_id, "colr")
+            last = jpx.box[-1]
+            self.assertEqual(last.box_id, "cgrp")
+            self.assertEqual(last.box[0].box_id, "colr")
+            self.assertEqual(last.box[1].box_id, "colr")
 
     def test_label_neg(self):
         """Can't write a label box embedded in any old box."""
-        jp2 = Jp2k(self.jp2file)
-        boxes = jp2.box
+        jp2 = self.jp2
+        boxes = copy.deepcopy(jp2.box)
 
         # The ftyp box must be modified to jpx.
         boxes[1].brand = "jpx "
@@ -194,15 +199,14 @@ class TestJPXWrap(fixtures.TestCommon):
 
     def test_cgrp_neg(self):
         """Can't write a cgrp with anything but colr sub boxes"""
-        jp2 = Jp2k(self.jp2file)
-        boxes = jp2.box
+        jp2 = self.jp2
+        boxes = copy.deepcopy(jp2.box)
 
         # The ftyp box must be modified to jpx.
         boxes[1].brand = "jpx "
         boxes[1].compatibility_list = ["jp2 ", "jpxb"]
 
-        the_xml = ET.fromstring('<?xml version="1.0"?><data>0</data>')
-        xmlb = glymur.jp2box.XMLBox(xml=the_xml)
+        xmlb = glymur.jp2box.XMLBox(xml=self.xml)
         box = [xmlb]
 
         cgrp = glymur.jp2box.ColourGroupBox(box=box)
@@ -219,8 +223,8 @@ class TestJPXWrap(fixtures.TestCommon):
         # Add a negative test where ref > 0 but no data reference box.
         # Add a negative test where more than one flst
         # Add negative test where ftbl contained in a superbox.
-        jp2 = Jp2k(self.jp2file)
-        boxes = jp2.box
+        jp2 = self.jp2
+        boxes = copy.deepcopy(jp2.box)
 
         # The ftyp box must be modified to jpx.
         boxes[1].brand = "jpx "
@@ -236,14 +240,15 @@ class TestJPXWrap(fixtures.TestCommon):
         with open(self.temp_jpx_filename, mode="wb") as tfile:
             jpx = jp2.wrap(tfile.name, boxes=boxes)
 
+            last = jpx.box[-1]
             self.assertEqual(jpx.box[1].compatibility_list, ["jp2 ", "jpxb"])
-            self.assertEqual(jpx.box[-1].box_id, "ftbl")
-            self.assertEqual(jpx.box[-1].box[0].box_id, "flst")
+            self.assertEqual(last.box_id, "ftbl")
+            self.assertEqual(last.box[0].box_id, "flst")
 
     def test_jpxb_compatibility(self):
         """Wrap JP2 to JPX, state jpxb compatibility"""
-        jp2 = Jp2k(self.jp2file)
-        boxes = jp2.box
+        jp2 = self.jp2
+        boxes = copy.deepcopy(jp2.box)
 
         # The ftyp box must be modified to jpx with jp2 compatibility.
         boxes[1].brand = "jpx "
@@ -251,29 +256,29 @@ class TestJPXWrap(fixtures.TestCommon):
 
         numbers = (0, 1)
         nlst = glymur.jp2box.NumberListBox(numbers)
-        b = BytesIO(b'<?xml version="1.0"?><data>0</data>')
-        doc = ET.parse(b)
-        xmlb = glymur.jp2box.XMLBox(xml=doc)
+        xmlb = glymur.jp2box.XMLBox(xml=self.xml)
         asoc = glymur.jp2box.AssociationBox([nlst, xmlb])
         boxes.append(asoc)
 
         with open(self.temp_jpx_filename, mode="wb") as tfile:
             jpx = jp2.wrap(tfile.name, boxes=boxes)
 
+            last = jpx.box[-1]
+            first, second = last.box[0], last.box[1]
             self.assertEqual(jpx.box[1].compatibility_list, ["jp2 ", "jpxb"])
-            self.assertEqual(jpx.box[-1].box_id, "asoc")
-            self.assertEqual(jpx.box[-1].box[0].box_id, "nlst")
-            self.assertEqual(jpx.box[-1].box[1].box_id, "xml ")
-            self.assertEqual(jpx.box[-1].box[0].associations, numbers)
+            self.assertEqual(last.box_id, "asoc")
+            self.assertEqual(first.box_id, "nlst")
+            self.assertEqual(second.box_id, "xml ")
+            self.assertEqual(first.associations, numbers)
             self.assertEqual(
-                ET.tostring(jpx.box[-1].box[1].xml.getroot()),
+                ET.tostring(second.xml.getroot()),
                 b"<data>0</data>"
             )
 
     def test_association_label_box(self):
         """Wrap JP2 to JPX with asoc, label, and nlst boxes"""
-        jp2 = Jp2k(self.jp2file)
-        boxes = jp2.box
+        jp2 = self.jp2
+        boxes = copy.deepcopy(jp2.box)
 
         # The ftyp box must be modified to jpx with jp2 compatibility.
         boxes[1].brand = "jpx "
@@ -283,31 +288,31 @@ class TestJPXWrap(fixtures.TestCommon):
         lblb = glymur.jp2box.LabelBox(label)
         numbers = (0, 1)
         nlst = glymur.jp2box.NumberListBox(numbers)
-        b = BytesIO(b'<?xml version="1.0"?><data>0</data>')
-        doc = ET.parse(b)
-        xmlb = glymur.jp2box.XMLBox(xml=doc)
+        xmlb = glymur.jp2box.XMLBox(xml=self.xml)
         asoc = glymur.jp2box.AssociationBox([nlst, xmlb, lblb])
         boxes.append(asoc)
 
         with open(self.temp_jpx_filename, mode="wb") as tfile:
             jpx = jp2.wrap(tfile.name, boxes=boxes)
 
+            last = jpx.box[-1]
+            first, second, third = last.box[0], last.box[1], last.box[2]
             self.assertEqual(jpx.box[1].compatibility_list, ["jp2 ", "jpx "])
-            self.assertEqual(jpx.box[-1].box_id, "asoc")
-            self.assertEqual(jpx.box[-1].box[0].box_id, "nlst")
-            self.assertEqual(jpx.box[-1].box[0].associations, numbers)
-            self.assertEqual(jpx.box[-1].box[1].box_id, "xml ")
+            self.assertEqual(last.box_id, "asoc")
+            self.assertEqual(first.box_id, "nlst")
+            self.assertEqual(first.associations, numbers)
+            self.assertEqual(second.box_id, "xml ")
             self.assertEqual(
-                ET.tostring(jpx.box[-1].box[1].xml.getroot()),
+                ET.tostring(second.xml.getroot()),
                 b"<data>0</data>"
             )
-            self.assertEqual(jpx.box[-1].box[2].box_id, "lbl ")
-            self.assertEqual(jpx.box[-1].box[2].label, label)
+            self.assertEqual(third.box_id, "lbl ")
+            self.assertEqual(third.label, label)
 
     def test_empty_data_reference(self):
         """Empty data reference boxes can be created, but not written."""
-        jp2 = Jp2k(self.jp2file)
-        boxes = jp2.box
+        jp2 = self.jp2
+        boxes = copy.deepcopy(jp2.box)
 
         boxes[1].brand = "jpx "
 
@@ -320,8 +325,8 @@ class TestJPXWrap(fixtures.TestCommon):
 
     def test_deurl_child_of_dtbl(self):
         """Data reference boxes can only contain data entry url boxes."""
-        jp2 = Jp2k(self.jp2file)
-        boxes = jp2.box
+        jp2 = self.jp2
+        boxes = copy.deepcopy(jp2.box)
 
         ftyp = glymur.jp2box.FileTypeBox()
         with warnings.catch_warnings():
@@ -340,8 +345,8 @@ class TestJPXWrap(fixtures.TestCommon):
 
     def test_only_one_data_reference(self):
         """Data reference boxes cannot be inside a superbox ."""
-        jp2 = Jp2k(self.jp2file)
-        boxes = jp2.box
+        jp2 = self.jp2
+        boxes = copy.deepcopy(jp2.box)
 
         # Have to make the ftyp brand jpx.
         boxes[1].brand = "jpx "
@@ -360,8 +365,8 @@ class TestJPXWrap(fixtures.TestCommon):
 
     def test_lbl_at_top_level(self):
         """Label boxes can only be inside a asoc box ."""
-        jp2 = Jp2k(self.jp2file)
-        boxes = jp2.box
+        jp2 = self.jp2
+        boxes = copy.deepcopy(jp2.box)
 
         # Have to make the ftyp brand jpx.
         boxes[1].brand = "jpx "
@@ -377,8 +382,8 @@ class TestJPXWrap(fixtures.TestCommon):
 
     def test_data_reference_in_subbox(self):
         """Data reference boxes cannot be inside a superbox ."""
-        jp2 = Jp2k(self.jp2file)
-        boxes = jp2.box
+        jp2 = self.jp2
+        boxes = copy.deepcopy(jp2.box)
 
         # Have to make the ftyp brand jpx.
         boxes[1].brand = "jpx "
@@ -398,8 +403,8 @@ class TestJPXWrap(fixtures.TestCommon):
 
     def test_jp2_to_jpx_sans_jp2_compatibility(self):
         """jp2 wrapped to jpx not including jp2 compatibility is wrong."""
-        jp2 = Jp2k(self.jp2file)
-        boxes = jp2.box
+        jp2 = self.jp2
+        boxes = copy.deepcopy(jp2.box)
 
         # Have to make the ftyp brand jpx.
         boxes[1].brand = "jpx "
@@ -407,8 +412,7 @@ class TestJPXWrap(fixtures.TestCommon):
 
         numbers = [0, 1]
         nlst = glymur.jp2box.NumberListBox(numbers)
-        the_xml = ET.fromstring('<?xml version="1.0"?><data>0</data>')
-        xmlb = glymur.jp2box.XMLBox(xml=the_xml)
+        xmlb = glymur.jp2box.XMLBox(xml=self.xml)
         asoc = glymur.jp2box.AssociationBox([nlst, xmlb])
         boxes.append(asoc)
 
@@ -418,13 +422,12 @@ class TestJPXWrap(fixtures.TestCommon):
 
     def test_jp2_to_jpx_sans_jpx_brand(self):
         """Verify error when jp2 wrapped to jpx does not include jpx brand."""
-        jp2 = Jp2k(self.jp2file)
-        boxes = jp2.box
+        jp2 = self.jp2
+        boxes = copy.deepcopy(jp2.box)
         boxes[1].brand = "jpx "
         numbers = [0, 1]
         nlst = glymur.jp2box.NumberListBox(numbers)
-        the_xml = ET.fromstring('<?xml version="1.0"?><data>0</data>')
-        xmlb = glymur.jp2box.XMLBox(xml=the_xml)
+        xmlb = glymur.jp2box.XMLBox(xml=self.xml)
         asoc = glymur.jp2box.AssociationBox([nlst, xmlb])
         boxes.append(asoc)
 
@@ -436,6 +439,16 @@ class TestJPXWrap(fixtures.TestCommon):
 class TestJPX(fixtures.TestCommon):
     """Test suite for other JPX boxes."""
 
+    @classmethod
+    def setUpClass(cls):
+        """
+        Parse the shipping JPX file only once for the read-only tests, and
+        keep its raw bytes for the tests that append boxes to a copy of it.
+        """
+        cls.jpx = Jp2k(cls.jpxfile)
+        with open(cls.jpxfile, "rb") as f:
+            cls.jpx_bytes = f.read()
+
     def test_reader_requirements_box(self):
         """
         SCENARIO:  A JPX file with a valid reader requirements box is
@@ -483,7 +496,7 @@ class TestJPX(fixtures.TestCommon):
         with self.assertWarns(UserWarning):
             flst = glymur.jp2box.FragmentListBox(offset, length, reference)
 
-        with tempfile.TemporaryFile() as tfile:
+        with BytesIO() as tfile:
             with self.assertRaises(InvalidJp2kError):
                 flst.write(tfile)
 
@@ -495,7 +508,7 @@ class TestJPX(fixtures.TestCommon):
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
             flst = glymur.jp2box.FragmentListBox(offset, length, reference)
-        with tempfile.TemporaryFile() as tfile:
+        with BytesIO() as tfile:
             with self.assertRaises(InvalidJp2kError):
                 flst.write(tfile)
 
@@ -507,14 +520,36 @@ class TestJPX(fixtures.TestCommon):
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
             flst = glymur.jp2box.FragmentListBox(offset, length, reference)
-        with tempfile.TemporaryFile() as tfile:
+        with BytesIO() as tfile:
             with self.assertRaises(InvalidJp2kError):
                 flst.write(tfile)
 
+    def test_flst_multiple_fragments(self):
+        """
+        SCENARIO:  Write a fragment list box with more than one fragment.
+
+        EXPECTED RESULT:  The fragments are read back in the same order.
+        """
+        offset = (89, 4237)
+        length = (1132288, 170246)
+        reference = (0, 3)
+        flst = glymur.jp2box.FragmentListBox(offset, length, reference)
+
+        b = BytesIO()
+        flst.write(b)
+        self.assertEqual(len(b.getvalue()), 8 + 2 + 2 * 14)
+
+        b.seek(8)
+        box = FragmentListBox.parse(b, 0, len(b.getvalue()))
+
+        self.assertEqual(box.fragment_offset, offset)
+        self.assertEqual(box.fragment_length, length)
+        self.assertEqual(box.data_reference, reference)
+
     def test_ftbl_boxes_empty(self):
         """A fragment table box must have at least one child box."""
         ftbl = glymur.jp2box.FragmentTableBox()
-        with tempfile.TemporaryFile() as tfile:
+        with BytesIO() as tfile:
             with self.assertRaises(InvalidJp2kError):
                 ftbl.write(tfile)
 
@@ -522,7 +557,7 @@ class TestJPX(fixtures.TestCommon):
         """A fragment table box can only contain a fragment list."""
         free = glymur.jp2box.FreeBox()
         ftbl = glymur.jp2box.FragmentTableBox(box=[free])
-        with tempfile.TemporaryFile() as tfile:
+        with BytesIO() as tfile:
             with self.assertRaises(InvalidJp2kError):
                 ftbl.write(tfile)
 
@@ -551,57 +586,60 @@ class TestJPX(fixtures.TestCommon):
         flag = 0
         version = (0, 0, 0)
         url1 = "file:////usr/local/bin"
-        url2 = "http://glymur.readthedocs.org" + chr(0) * 3
-        with open(self.temp_jpx_filename, mode="wb") as tfile:
-            with open(self.jpxfile, "rb") as ifile:
-                tfile.write(ifile.read())
+        url2 = _URL2
+        deurl1 = glymur.jp2box.DataEntryURLBox(flag, version, url1)
+        deurl2 = glymur.jp2box.DataEntryURLBox(flag, version, url2)
+        dref = glymur.jp2box.DataReferenceBox([deurl1, deurl2])
+        b = BytesIO()
+        dref.write(b)
 
-                deurl1 = glymur.jp2box.DataEntryURLBox(flag, version, url1)
-                deurl2 = glymur.jp2box.DataEntryURLBox(flag, version, url2)
-                dref = glymur.jp2box.DataReferenceBox([deurl1, deurl2])
-                dref.write(tfile)
+        write_buffer = bytearray(self.jpx_bytes)
+        write_buffer += b.getvalue()
 
-                # Free box.  The content does not matter.
-                tfile.write(struct.pack(">I4s", 12, b"free"))
-                tfile.write(struct.pack(">I", 0))
+        # Free box.  The content does not matter.
+        write_buffer += _FREE.pack(12, b"free", 0)
 
+        with open(self.temp_jpx_filename, mode="wb") as tfile:
+            tfile.write(write_buffer)
             tfile.flush()
 
             jpx = Jp2k(tfile.name)
 
-            self.assertEqual(jpx.box[-2].box_id, "dtbl")
-            self.assertEqual(len(jpx.box[-2].DR), 2)
-            self.assertEqual(jpx.box[-2].DR[0].url, url1)
-            self.assertEqual(jpx.box[-2].DR[1].url, url2.rstrip("\0"))
+            dtbl = jpx.box[-2]
+            self.assertEqual(dtbl.box_id, "dtbl")
+            self.assertEqual(len(dtbl.DR), 2)
+            self.assertEqual(dtbl.DR[0].url, url1)
+            self.assertEqual(dtbl.DR[1].url, _URL2_STRIPPED)
 
             self.assertEqual(jpx.box[-1].box_id, "free")
 
     def test_ftbl(self):
         """Verify that we can interpret Fragment Table boxes."""
         # Copy the existing JPX file, add a fragment table box onto the end.
-        with open(self.temp_jpx_filename, mode="wb") as tfile:
-            with open(self.jpxfile, "rb") as ifile:
-                tfile.write(ifile.read())
-            write_buffer = struct.pack(">I4s", 32, b"ftbl")
-            tfile.write(write_buffer)
+        n = len(self.jpx_bytes)
+        write_buffer = bytearray(n + 32)
+        write_buffer[:n] = self.jpx_bytes
+        _BOX_HDR.pack_into(write_buffer, n, 32, b"ftbl")
 
-            # Just one fragment list box
-            write_buffer = struct.pack(">I4s", 24, b"flst")
-            tfile.write(write_buffer)
+        # Just one fragment list box
+        _BOX_HDR.pack_into(write_buffer, n + 8, 24, b"flst")
 
-            # Simple offset, length, reference
-            write_buffer = struct.pack(">HQIH", 1, 4237, 170246, 3)
-            tfile.write(write_buffer)
+        # Simple offset, length, reference
+        _FLST_ENTRY.pack_into(write_buffer, n + 16, 1, 4237, 170246, 3)
 
+        with open(self.temp_jpx_filename, mode="wb") as tfile:
+            tfile.write(write_buffer)
             tfile.flush()
 
             jpx = Jp2k(tfile.name)
 
-            self.assertEqual(jpx.box[-1].box_id, "ftbl")
-            self.assertEqual(jpx.box[-1].box[0].box_id, "flst")
-            self.assertEqual(jpx.box[-1].box[0].fragment_offset, (4237,))
-            self.assertEqual(jpx.box[-1].box[0].fragment_length, (170246,))
-            self.assertEqual(jpx.box[-1].box[0].data_reference, (3,))
+            last = jpx.box[-1]
+            first = last.box[0]
+            self.assertEqual(last.box_id, "ftbl")
+            self.assertEqual(first.box_id, "flst")
+            self.assertEqual(first.fragment_offset, (4237,))
+            self.assertEqual(first.fragment_length, (170246,))
+            self.assertEqual(first.data_reference, (3,))
 
     def test_rreq3(self):
         """
@@ -611,7 +649,7 @@ class TestJPX(fixtures.TestCommon):
         EXPECTED RESULT:  A warning is issued.
         """
         rreq_buffer = ctypes.create_string_buffer(74)
-        struct.pack_into(">I4s", rreq_buffer, 0, 74, b"rreq")
+        _BOX_HDR.pack_into(rreq_buffer, 0, 74, b"rreq")
 
         # mask length
         struct.pack_into(">B", rreq_buffer, 8, 3)
@@ -650,20 +688,19 @@ class TestJPX(fixtures.TestCommon):
 
         # Ok, done with the box, we can now insert it into the jpx file after
         # the ftyp box.
+        write_buffer = (
+            self.jpx_bytes[:40] + rreq_buffer.raw + self.jpx_bytes[40:]
+        )
         with open(self.temp_jpx_filename, mode="wb") as ofile:
-            with open(self.jpxfile, "rb") as ifile:
-                ofile.write(ifile.read(40))
-                ofile.write(rreq_buffer)
-                ofile.write(ifile.read())
-                ofile.flush()
+            ofile.write(write_buffer)
+            ofile.flush()
 
             with self.assertWarns(UserWarning):
                 Jp2k(ofile.name)
 
     def test_nlst(self):
         """Verify that we can handle a number list box."""
-        j = Jp2k(self.jpxfile)
-        nlst = j.box[12].box[0].box[0]
+        nlst = self.jpx.box[12].box[0].box[0]
         self.assertEqual(nlst.box_id, "nlst")
         self.assertEqual(type(nlst), glymur.jp2box.NumberListBox)
 
@@ -260,9 +260,7 @@ class TestSuite(fixtures.TestCommon):
         """
         the_uuid = uuid.UUID("be7acfcb-97a9-42e8-9c71-999491e3afac")
         raw_data = (
-            ir.files("tests.data.misc")
-            .joinpath("simple_rdf.txt")
-            .read_text()
+            fixtures.load_test_data("tests.data.misc", "simple_rdf.txt")
             .encode("utf-8")
         )
 
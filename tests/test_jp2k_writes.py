@@ -18,12 +18,24 @@ from glymur import Jp2k
 from glymur.jp2box import InvalidJp2kError
 from . import fixtures
 from .fixtures import OPENJPEG_NOT_AVAILABLE, OPENJPEG_NOT_AVAILABLE_MSG
+from .fixtures import get_siz_fields
 
 
 @unittest.skipIf(OPENJPEG_NOT_AVAILABLE, OPENJPEG_NOT_AVAILABLE_MSG)
 class TestSuite(fixtures.TestCommon):
     """Test writing Jpeg2000 files"""
 
+    # Bit masks of the code-block style flags, in the order in which the
+    # styles are given to _verify_codeblock_style.
+    _CODEBLOCK_STYLE_MASKS = (
+        0x01,  # Selective arithmetic coding bypass
+        0x02,  # Reset context probabilities
+        0x04,  # Termination on each coding pass
+        0x08,  # Vertically causal context
+        0x10,  # Predictable termination
+        0x20,  # Segmentation symbols
+    )
+
     @classmethod
     def setUpClass(cls):
         cls.jp2file = glymur.data.nemo()
@@ -51,11 +63,7 @@ class TestSuite(fixtures.TestCommon):
         """
         Verify the fields of the SIZ segment.
         """
-        for field in [
-            'rsiz', 'xsiz', 'ysiz', 'xosiz', 'yosiz', 'xtsiz', 'ytsiz',
-            'xtosiz', 'ytosiz', 'bitdepth', 'xrsiz', 'yrsiz'
-        ]:
-            self.assertEqual(getattr(actual, field), getattr(expected, field))
+        self.assertEqual(get_siz_fields(actual), get_siz_fields(expected))
 
     def _verify_codeblock_style(self, actual, styles):
         """
@@ -64,19 +72,10 @@ class TestSuite(fixtures.TestCommon):
         This information is stored in a single byte.  Please reference
         Table A-17 in FCD15444-1
         """
-        expected = 0
-        masks = [
-            0x01,  # Selective arithmetic coding bypass
-            0x02,  # Reset context probabilities
-            0x04,  # Termination on each coding pass
-            0x08,  # Vertically causal context
-            0x10,  # Predictable termination
-            0x20,  # Segmentation symbols
-        ]
-        for style, mask in zip(styles, masks):
-            if style:
-                expected |= mask
-
+        expected = sum(
+            mask * bool(style)
+            for style, mask in zip(styles, self._CODEBLOCK_STYLE_MASKS)
+        )
         self.assertEqual(actual, expected)
 
     def test_write_to_fully_formed_jp2k(self):
@@ -1224,8 +1223,8 @@ class TestSuite(fixtures.TestCommon):
 
         actdata = j[:]
 
-        diff = actdata.astype(np.double) - expdata.astype(np.double)
-        mse = np.mean(diff**2)
+        diff = np.subtract(actdata, expdata, dtype=np.int64)
+        mse = np.vdot(diff, diff) / diff.size
 
         self.assertTrue(mse < 0.28)
 
@@ -1522,7 +1521,7 @@ class TestSuite(fixtures.TestCommon):
                 # Write the contained label box
                 write_buffer = struct.pack('>I4s', int(13), b'lbl ')
                 tfile2.write(write_buffer)
-                tfile2.write('label'.encode())
+                tfile2.write(b'label')
 
                 # Write the xml box
                 # Length = 36, id is 'xml '.
@@ -765,14 +765,14 @@ class TestJp2kr(fixtures.TestCommon):
         buffer += b'\x00' * 2 + b'scnr' + b'RGB ' + b'XYZ '
         # Need a date in bytes 24:36
         buffer += struct.pack('>HHHHHH', 2001, 8, 30, 13, 32, 37)
-        buffer += 'acsp'.encode('utf-8')
+        buffer += b'acsp'
         buffer += b'\x00\x00\x00\x00'
         buffer += b'\x00\x00\x00\x01'  # platform
-        buffer += 'KODA'.encode('utf-8')  # 48 - 52
-        buffer += 'ROMM'.encode('utf-8')  # Device Model
+        buffer += b'KODA'  # 48 - 52
+        buffer += b'ROMM'  # Device Model
         buffer += b'\x00' * 12
         buffer += struct.pack('>III', 63190, 65536, 54061)  # 68 - 80
-        buffer += 'JPEG'.encode('utf-8')  # 80 - 84
+        buffer += b'JPEG'  # 80 - 84
         buffer += b'\x00' * 44
         fp.write(buffer)
         fp.seek(8)
@@ -780,34 +780,31 @@ class TestJp2kr(fixtures.TestCommon):
         box = glymur.jp2box.ColourSpecificationBox.parse(fp, 0, 557)
         profile = box.icc_profile_header
 
-        self.assertEqual(profile['Size'], 546)
-        self.assertEqual(profile['Preferred CMM Type'], 0)
-        self.assertEqual(profile['Version'], '2.2.0')
-        self.assertEqual(profile['Device Class'], 'input device profile')
-        self.assertEqual(profile['Color Space'], 'RGB')
-        self.assertEqual(profile['Datetime'],
-                         datetime.datetime(2001, 8, 30, 13, 32, 37))
-        self.assertEqual(profile['File Signature'], 'acsp')
-        self.assertEqual(profile['Platform'], 'unrecognized')
-        self.assertEqual(profile['Flags'],
-                         'embedded, can be used independently')
-
-        self.assertEqual(profile['Device Manufacturer'], 'KODA')
-        self.assertEqual(profile['Device Model'], 'ROMM')
-
-        self.assertEqual(profile['Device Attributes'],
-                         ('reflective, glossy, positive media polarity, '
-                          'color media'))
-        self.assertEqual(profile['Rendering Intent'], 'perceptual')
+        expected = {
+            'Size': 546,
+            'Preferred CMM Type': 0,
+            'Version': '2.2.0',
+            'Device Class': 'input device profile',
+            'Color Space': 'RGB',
+            'Datetime': datetime.datetime(2001, 8, 30, 13, 32, 37),
+            'File Signature': 'acsp',
+            'Platform': 'unrecognized',
+            'Flags': 'embedded, can be used independently',
+            'Device Manufacturer': 'KODA',
+            'Device Model': 'ROMM',
+            'Device Attributes': (
+                'reflective, glossy, positive media polarity, color media'
+            ),
+            'Rendering Intent': 'perceptual',
+            'Creator': 'JPEG',
+        }
+        actual = {k: profile[k] for k in expected}
+        self.assertEqual(actual, expected)
 
         np.testing.assert_almost_equal(
-            profile['Illuminant'],
-            (0.964203, 1.000000, 0.824905),
-            decimal=6
+            profile['Illuminant'], (0.964203, 1.000000, 0.824905), decimal=6
         )
 
-        self.assertEqual(profile['Creator'], 'JPEG')
-
     @unittest.skipIf(OPENJPEG_NOT_AVAILABLE, OPENJPEG_NOT_AVAILABLE_MSG)
     def test_different_layers(self):
         """
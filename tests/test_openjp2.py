@@ -2,8 +2,8 @@
 Tests for libopenjp2 wrapping functions.
 """
 # Standard library imports ...
-from contextlib import ExitStack
-import importlib.resources as ir
+import contextlib
+import ctypes
 from io import StringIO
 import unittest
 from unittest.mock import patch
@@ -18,6 +18,9 @@ from glymur.lib import openjp2
 from . import fixtures
 from .fixtures import OPENJPEG_NOT_AVAILABLE, OPENJPEG_NOT_AVAILABLE_MSG
 
+# tile height and width used by the tile writing tests
+_TILE_SHAPE = (256, 256)
+
 
 @unittest.skipIf(OPENJPEG_NOT_AVAILABLE, OPENJPEG_NOT_AVAILABLE_MSG)
 class TestOpenJP2(fixtures.TestCommon):
@@ -25,6 +28,18 @@ class TestOpenJP2(fixtures.TestCommon):
 
     Some tests correspond to those in the openjpeg test suite.
     """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Decode the scikit-image sample images used by the tile writing tests
+        just once.  The tests only read from them.  Likewise only ask the
+        library for the default encoder parameters once, each test gets its
+        own copy.
+        """
+        cls.moon = skimage.data.moon()
+        cls.astronaut = skimage.data.astronaut()
+        cls.default_cparams = openjp2.set_default_encoder_parameters()
+
     def test_no_openjp2_library(self):
         """
         SCENARIO:  There is no openjp2 library.
@@ -188,12 +203,12 @@ class TestOpenJP2(fixtures.TestCommon):
         """
         Test writing tiles for a 2D image.
         """
-        img = skimage.data.moon()
+        img = self.moon
 
         num_comps = 1
         image_height, image_width = img.shape
 
-        tile_height, tile_width = 256, 256
+        tile_height, tile_width = _TILE_SHAPE
 
         comp_prec = 8
         irreversible = True
@@ -202,7 +217,9 @@ class TestOpenJP2(fixtures.TestCommon):
 
         numresolution = 6
 
-        cparams = openjp2.set_default_encoder_parameters()
+        cparams = openjp2.CompressionParametersType.from_buffer_copy(
+            self.default_cparams
+        )
 
         cparams.tile_size_on = openjp2.TRUE
         cparams.cp_tdx = tile_width
@@ -219,22 +236,14 @@ class TestOpenJP2(fixtures.TestCommon):
         cparams.tcp_mct = 0
 
         # comptparms == l_params
-        comptparms = (openjp2.ImageComptParmType * num_comps)()
-        for j in range(num_comps):
-            comptparms[j].dx = 1
-            comptparms[j].dy = 1
-            comptparms[j].w = tile_width
-            comptparms[j].h = tile_height
-            comptparms[j].x0 = 0
-            comptparms[j].y0 = 0
-            comptparms[j].prec = comp_prec
-            comptparms[j].bpp = comp_prec
-            comptparms[j].sgnd = 0
-
-        with ExitStack() as stack:
-
-            codec = openjp2.create_compress(openjp2.CODEC_J2K)
-            stack.callback(openjp2.destroy_codec, codec)
+        comptparms = _component_parameters(
+            num_comps, tile_width, tile_height, comp_prec
+        )
+
+        filename = str(self.temp_j2k_filename)
+        with _encoder_context(
+            comptparms, openjp2.CLRSPC_GRAY, filename
+        ) as (codec, image, strm):
 
             info_handler = openjp2._INFO_CALLBACK
 
@@ -242,27 +251,27 @@ class TestOpenJP2(fixtures.TestCommon):
             openjp2.set_warning_handler(codec, openjp2._WARNING_CALLBACK)
             openjp2.set_error_handler(codec, openjp2._ERROR_CALLBACK)
 
-            # l_params == comptparms
-            # l_image == tile
-            image = openjp2.image_tile_create(comptparms, openjp2.CLRSPC_GRAY)
-            stack.callback(openjp2.image_destroy, image)
-
             image.contents.x0, image.contents.y0 = 0, 0
             image.contents.x1, image.contents.y1 = image_width, image_height
             image.contents.color_space = openjp2.CLRSPC_GRAY
 
             openjp2.setup_encoder(codec, cparams, image)
 
-            filename = str(self.temp_j2k_filename)
-            strm = openjp2.stream_create_default_file_stream(filename, False)
-            stack.callback(openjp2.stream_destroy, strm)
-
             openjp2.start_compress(codec, image, strm)
 
-            openjp2.write_tile(codec, 0, img[0:256, 0:256].copy(), strm)
-            openjp2.write_tile(codec, 1, img[0:256, 256:512].copy(), strm)
-            openjp2.write_tile(codec, 2, img[256:512, 0:256].copy(), strm)
-            openjp2.write_tile(codec, 3, img[256:512, 256:512].copy(), strm)
+            # The tiles must be contiguous, so stage each one through the
+            # same buffer rather than allocating a copy per tile.  The
+            # pointer to that buffer only needs to be made once, too.
+            tile = np.empty((tile_height, tile_width), dtype=img.dtype)
+            tile_p = tile.ctypes.data_as(ctypes.POINTER(ctypes.c_uint8))
+            tile_index = 0
+            for r in range(0, image_height, tile_height):
+                for c in range(0, image_width, tile_width):
+                    np.copyto(tile, img[r:r + tile_height, c:c + tile_width])
+                    openjp2.write_tile(
+                        codec, tile_index, tile_p, tile.nbytes, strm
+                    )
+                    tile_index += 1
 
             openjp2.end_compress(codec, strm)
 
@@ -271,11 +280,11 @@ class TestOpenJP2(fixtures.TestCommon):
         Test writing tiles for an RGB image.
         """
 
-        img = skimage.data.astronaut()
+        img = self.astronaut
 
         image_height, image_width, num_comps = img.shape
 
-        tile_height, tile_width = 256, 256
+        tile_height, tile_width = _TILE_SHAPE
 
         comp_prec = 8
         irreversible = False
@@ -284,7 +293,9 @@ class TestOpenJP2(fixtures.TestCommon):
 
         numresolution = 6
 
-        cparams = openjp2.set_default_encoder_parameters()
+        cparams = openjp2.CompressionParametersType.from_buffer_copy(
+            self.default_cparams
+        )
 
         outfile = str(self.temp_j2k_filename).encode()
         num_pad_bytes = openjp2.PATH_LEN - len(outfile)
@@ -315,21 +326,14 @@ class TestOpenJP2(fixtures.TestCommon):
         cparams.tcp_distoratio[0] = 0
 
         # comptparms == l_params
-        comptparms = (openjp2.ImageComptParmType * num_comps)()
-        for j in range(num_comps):
-            comptparms[j].dx = 1
-            comptparms[j].dy = 1
-            comptparms[j].w = image_width
-            comptparms[j].h = image_height
-            comptparms[j].x0 = 0
-            comptparms[j].y0 = 0
-            comptparms[j].prec = comp_prec
-            comptparms[j].bpp = comp_prec
-            comptparms[j].sgnd = 0
-
-        with ExitStack() as stack:
-            codec = openjp2.create_compress(openjp2.CODEC_J2K)
-            stack.callback(openjp2.destroy_codec, codec)
+        comptparms = _component_parameters(
+            num_comps, image_width, image_height, comp_prec
+        )
+
+        filename = str(self.temp_j2k_filename)
+        with _encoder_context(
+            comptparms, openjp2.CLRSPC_SRGB, filename
+        ) as (codec, image, strm):
 
             info_handler = openjp2._INFO_CALLBACK
 
@@ -337,61 +341,137 @@ class TestOpenJP2(fixtures.TestCommon):
             openjp2.set_warning_handler(codec, openjp2._WARNING_CALLBACK)
             openjp2.set_error_handler(codec, openjp2._ERROR_CALLBACK)
 
-            image = openjp2.image_tile_create(comptparms, openjp2.CLRSPC_SRGB)
-            stack.callback(openjp2.image_destroy, image)
-
             image.contents.x0, image.contents.y0 = 0, 0
             image.contents.x1, image.contents.y1 = image_width, image_height
             image.contents.color_space = openjp2.CLRSPC_SRGB
 
             openjp2.setup_encoder(codec, cparams, image)
 
-            filename = str(self.temp_j2k_filename)
-            strm = openjp2.stream_create_default_file_stream(filename, False)
-            stack.callback(openjp2.stream_destroy, strm)
-
             openjp2.start_compress(codec, image, strm)
 
             # have to change the memory layout of 3D images in order to use
-            # opj_write_tile
-            openjp2.write_tile(
-                codec, 0, _set_planar_pixel_order(img[0:256, 0:256, :]), strm
-            )
-            openjp2.write_tile(
-                codec, 1, _set_planar_pixel_order(img[0:256, 256:512, :]), strm
-            )
-            openjp2.write_tile(
-                codec, 2, _set_planar_pixel_order(img[256:512, 0:256, :]), strm
-            )
-            openjp2.write_tile(
-                codec, 3, _set_planar_pixel_order(img[256:512, 256:512, :]),
-                strm
+            # opj_write_tile, so each tile is staged plane-by-plane through
+            # the same buffer
+            tile = np.empty(
+                (num_comps, tile_height, tile_width), dtype=img.dtype
             )
+            tile_p = tile.ctypes.data_as(ctypes.POINTER(ctypes.c_uint8))
+            tile_index = 0
+            for r in range(0, image_height, tile_height):
+                for c in range(0, image_width, tile_width):
+                    np.copyto(
+                        tile,
+                        np.moveaxis(
+                            img[r:r + tile_height, c:c + tile_width], -1, 0
+                        )
+                    )
+                    openjp2.write_tile(
+                        codec, tile_index, tile_p, tile.nbytes, strm
+                    )
+                    tile_index += 1
 
             openjp2.end_compress(codec, strm)
 
+    def test_write_tile_from_pointer(self):
+        """
+        SCENARIO:  Write tiles by passing write_tile a pointer to the staged
+        tile data along with the size of the tile in bytes.
+
+        EXPECTED RESULT:  The image read back matches what was written.
+        """
+        expected = self.moon[:256, :256]
+        image_height, image_width = expected.shape
+        tile_height, tile_width = 128, 128
 
-def _set_planar_pixel_order(img):
+        cparams = openjp2.CompressionParametersType.from_buffer_copy(
+            self.default_cparams
+        )
+        cparams.tile_size_on = openjp2.TRUE
+        cparams.cp_tdx = tile_width
+        cparams.cp_tdy = tile_height
+
+        comptparms = _component_parameters(1, tile_width, tile_height, 8)
+
+        filename = str(self.temp_j2k_filename)
+        with _encoder_context(
+            comptparms, openjp2.CLRSPC_GRAY, filename
+        ) as (codec, image, strm):
+
+            image.contents.x0, image.contents.y0 = 0, 0
+            image.contents.x1, image.contents.y1 = image_width, image_height
+            image.contents.color_space = openjp2.CLRSPC_GRAY
+
+            openjp2.setup_encoder(codec, cparams, image)
+            openjp2.start_compress(codec, image, strm)
+
+            tile = np.empty((tile_height, tile_width), dtype=np.uint8)
+            tile_p = tile.ctypes.data_as(ctypes.POINTER(ctypes.c_uint8))
+            tile_index = 0
+            for r in range(0, image_height, tile_height):
+                for c in range(0, image_width, tile_width):
+                    np.copyto(
+                        tile, expected[r:r + tile_height, c:c + tile_width]
+                    )
+                    openjp2.write_tile(
+                        codec, tile_index, tile_p, tile.nbytes, strm
+                    )
+                    tile_index += 1
+
+            openjp2.end_compress(codec, strm)
+
+        actual = glymur.Jp2k(filename)[:]
+        np.testing.assert_array_equal(actual, expected)
+
+    def test_write_tile_pointer_without_size(self):
+        """
+        SCENARIO:  Pass write_tile a pointer to the tile data, but not the
+        size of the tile.
+
+        EXPECTED RESULT:  TypeError, the size cannot be inferred from a
+        pointer.
+        """
+        tile = np.zeros((8, 8), dtype=np.uint8)
+        tile_p = tile.ctypes.data_as(ctypes.POINTER(ctypes.c_uint8))
+        with self.assertRaises(TypeError):
+            openjp2.write_tile(None, 0, tile_p, None)
+
+
+@contextlib.contextmanager
+def _encoder_context(comptparms, colorspace, filename):
     """
-    Reorder the image pixels so that plane-0 comes first, then plane-1, etc.
-    This is a requirement for using opj_write_tile.
+    Provide the codec, image, and stream needed to write tiles, and make sure
+    that all of them are destroyed afterwards.
     """
-    if img.ndim == 3:
-        # C-order increments along the y-axis slowest (0), then x-axis (1),
-        # then z-axis (2).  We want it to go along the z-axis slowest, then
-        # y-axis, then x-axis.
-        img = np.swapaxes(img, 1, 2)
-        img = np.swapaxes(img, 0, 1)
+    codec = openjp2.create_compress(openjp2.CODEC_J2K)
+    try:
+        image = openjp2.image_tile_create(comptparms, colorspace)
+        try:
+            strm = openjp2.stream_create_default_file_stream(filename, False)
+            try:
+                yield codec, image, strm
+            finally:
+                openjp2.stream_destroy(strm)
+        finally:
+            openjp2.image_destroy(image)
+    finally:
+        openjp2.destroy_codec(codec)
+
 
-    return img.copy()
+def _component_parameters(num_comps, width, height, prec):
+    """
+    Build the component parameters for image_tile_create.  All components are
+    unsigned, not subsampled, and not offset, so they share the same values.
+    """
+    parm = openjp2.ImageComptParmType(
+        dx=1, dy=1, w=width, h=height, x0=0, y0=0, prec=prec, bpp=prec, sgnd=0
+    )
+    return (openjp2.ImageComptParmType * num_comps)(*[parm] * num_comps)
 
 
 def tile_encoder(**kwargs):
     """Fixture used by many tests."""
-    num_tiles = ((kwargs['image_width'] / kwargs['tile_width'])
-                 * (kwargs['image_height'] / kwargs['tile_height']))
-    tile_size = ((kwargs['tile_width'] * kwargs['tile_height'])
-                 * (kwargs['num_comps'] * kwargs['comp_prec'] / 8))
+    num_tiles = ((kwargs['image_width'] // kwargs['tile_width'])
+                 * (kwargs['image_height'] // kwargs['tile_height']))
 
     data = np.random.random((kwargs['tile_height'],
                              kwargs['tile_width'],
@@ -420,16 +500,10 @@ def tile_encoder(**kwargs):
 
     l_param.prog_order = glymur.core.LRCP
 
-    l_params = (openjp2.ImageComptParmType * kwargs['num_comps'])()
-    for j in range(kwargs['num_comps']):
-        l_params[j].dx = 1
-        l_params[j].dy = 1
-        l_params[j].h = kwargs['image_height']
-        l_params[j].w = kwargs['image_width']
-        l_params[j].sgnd = 0
-        l_params[j].prec = kwargs['comp_prec']
-        l_params[j].x0 = 0
-        l_params[j].y0 = 0
+    l_params = _component_parameters(
+        kwargs['num_comps'], kwargs['image_width'], kwargs['image_height'],
+        kwargs['comp_prec']
+    )
 
     codec = openjp2.create_compress(kwargs['codec'])
 
@@ -452,11 +526,11 @@ def tile_encoder(**kwargs):
                                                        False)
     openjp2.start_compress(codec, l_image, stream)
 
-    for j in np.arange(num_tiles):
+    for j in range(num_tiles):
         if 'short_sig' in kwargs and kwargs['short_sig']:
             openjp2.write_tile(codec, j, data, stream)
         else:
-            openjp2.write_tile(codec, j, data, tile_size, stream)
+            openjp2.write_tile(codec, j, data, data.nbytes, stream)
 
     openjp2.end_compress(codec, stream)
     openjp2.stream_destroy(stream)
@@ -595,10 +669,10 @@ class TestPrintingOpenjp2(unittest.TestCase):
             print(dparams)
             actual = fake_out.getvalue().strip()
         expected = (
-            ir.files('tests.data.misc')
-              .joinpath('decompression_parameters_type.txt')
-              .read_text()
-              .rstrip()
+            fixtures.load_test_data(
+                'tests.data.misc', 'decompression_parameters_type.txt'
+            )
+            .rstrip()
         )
         self.assertEqual(actual, expected)
 
@@ -609,10 +683,10 @@ class TestPrintingOpenjp2(unittest.TestCase):
             print(ptype)
             actual = fake_out.getvalue().strip()
         expected = (
-            ir.files('tests.data.misc')
-              .joinpath('default_progression_order_changes_type.txt')
-              .read_text()
-              .rstrip()
+            fixtures.load_test_data(
+                'tests.data.misc', 'default_progression_order_changes_type.txt'
+            )
+            .rstrip()
         )
         self.assertEqual(actual, expected)
 
@@ -623,9 +697,9 @@ class TestPrintingOpenjp2(unittest.TestCase):
             print(cparams)
             actual = fake_out.getvalue().strip()
         expected = (
-            ir.files('tests.data.misc')
-              .joinpath('default_compression_parameters_type.txt')
-              .read_text()
-              .rstrip()
+            fixtures.load_test_data(
+                'tests.data.misc', 'default_compression_parameters_type.txt'
+            )
+            .rstrip()
         )
         self.assertEqual(actual, expected)
@@ -352,13 +352,10 @@ class TestSuite(fixtures.TestCommon):
             with open(self.jpxfile, 'rb') as ifile:
                 tfile.write(ifile.read())
 
-            # Add the header for an unknown superbox.
-            write_buffer = struct.pack('>I4s', 20, 'grp '.encode())
-            tfile.write(write_buffer)
-
-            # Add a free box inside of it.  We won't be able to identify it,
-            # but it's there.
-            write_buffer = struct.pack('>I4sI', 12, 'free'.encode(), 0)
+            # Add the header for an unknown superbox, followed by a free box
+            # inside of it.  We won't be able to identify the free box, but
+            # it's there.
+            write_buffer = struct.pack('>I4sI4sI', 20, b'grp ', 12, b'free', 0)
             tfile.write(write_buffer)
             tfile.flush()
 